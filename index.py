@@ -3,9 +3,15 @@ import os
 import pathlib
 import importlib
 # from PIL import Image  # No longer needed - using sprite sheets instead of GIFs
-import time
 import math
 import json
+import pickle
+from array import array
+from bisect import bisect_right
+try:
+    import orjson  # Optional: much faster JSON parsing for large Tiled maps
+except ImportError:
+    orjson = None
 
 pygame.init()
 
@@ -35,155 +41,318 @@ TILE_SIZE = 16
 FLIPPED_HORIZONTALLY_FLAG = 0x80000000
 FLIPPED_VERTICALLY_FLAG   = 0x40000000
 FLIPPED_DIAGONALLY_FLAG   = 0x20000000
+GID_MASK = ~(FLIPPED_HORIZONTALLY_FLAG | FLIPPED_VERTICALLY_FLAG | FLIPPED_DIAGONALLY_FLAG)
+
+# Tile lists by tileset name, and by resolved PNG path so that aliases of one
+# file (e.g. 'cave' and 'Cave_1' -> cave_1.png) share a single list. Scenes
+# sharing a tileset therefore hit the same id(tiles)-keyed caches below.
+_TILESET_CACHE = {}
+_TILESET_BY_PATH = {}
+
+# Tilesets/ is scanned once: (lowercase name without extension, path) for every PNG, sorted by path
+_TILESET_DIR = 'Tilesets'
+_TILESET_PNGS = sorted(
+    ((os.path.splitext(fn)[0].lower(), os.path.join(_TILESET_DIR, fn))
+     for fn in (os.listdir(_TILESET_DIR) if os.path.isdir(_TILESET_DIR) else [])
+     if fn.lower().endswith('.png')),
+    key=lambda entry: entry[1]
+)
 
 def load_tileset(tileset_name):
     """Load a tileset and extract all tiles from it."""
+    cached = _TILESET_CACHE.get(tileset_name)
+    if cached is not None:
+        return cached
     # Resolve tileset image path robustly
-    base_dir = 'Tilesets'
+    base_dir = _TILESET_DIR
     candidate = os.path.join(base_dir, f'{tileset_name}.png')
     if not os.path.exists(candidate):
         # Try case-insensitive and prefix matches (e.g., 'cave' -> 'cave_1.png')
         try_name = tileset_name.lower()
-        matches = []
-        for fn in os.listdir(base_dir):
-            if not fn.lower().endswith('.png'):
-                continue
-            name_no_ext = os.path.splitext(fn)[0].lower()
-            if name_no_ext == try_name or name_no_ext.startswith(try_name):
-                matches.append(os.path.join(base_dir, fn))
+        matches = [path for name_no_ext, path in _TILESET_PNGS
+                   if name_no_ext == try_name or name_no_ext.startswith(try_name)]
         if matches:
-            matches.sort()
             candidate = matches[0]
             print(f"[WARN] Tileset '{tileset_name}.png' not found. Using '{os.path.basename(candidate)}' instead.")
         else:
-            available = ', '.join(sorted([fn for fn in os.listdir(base_dir) if fn.lower().endswith('.png')]))
+            available = ', '.join(sorted(os.path.basename(path) for _, path in _TILESET_PNGS))
             raise FileNotFoundError(f"No file '{os.path.join(base_dir, tileset_name + '.png')}' found. Available tilesets: {available}")
+    path_key = os.path.normcase(os.path.abspath(candidate))
+    cached = _TILESET_BY_PATH.get(path_key)
+    if cached is not None:
+        _TILESET_CACHE[tileset_name] = cached
+        return cached
     
     tileset_img = pygame.image.load(candidate).convert_alpha()
     tileset_width, tileset_height = tileset_img.get_size()
     
+    # Tiles are views into the one atlas surface (subsurfaces share its pixels),
+    # so a tileset is a single contiguous pixel buffer rather than one per tile
     tiles = []
     for y in range(0, tileset_height, TILE_SIZE):
         for x in range(0, tileset_width, TILE_SIZE):
             rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-            tile = tileset_img.subsurface(rect).copy()
-            tiles.append(tile)
+            tiles.append(tileset_img.subsurface(rect))
+    _TILESET_CACHE[tileset_name] = tiles
+    _TILESET_BY_PATH[path_key] = tiles
     return tiles
 
+# Transformed-tile LUTs by id(tiles) (tile lists live for the whole run in the
+# caches above): slot (local_index << 3) | flags3, filled lazily
+_TRANSFORM_LUT_CACHE = {}
+
+def get_transform_lut(tiles):
+    """Return the shared transformed-tile LUT for a loaded tileset's tile list."""
+    lut = _TRANSFORM_LUT_CACHE.get(id(tiles))
+    if lut is None:
+        lut = _TRANSFORM_LUT_CACHE[id(tiles)] = [None] * (len(tiles) * 8)
+    return lut
+
 
 def draw_tilemap_single(surface, tilemap, tiles, camera_x=0, camera_y=0):
     """Draw using a single tileset where tilemap indexes directly reference 'tiles'."""
-    # Only draw tiles that are visible on screen
+    # Only draw tiles that are visible on the target surface
+    view_w, view_h = surface.get_size()
     start_col = max(0, camera_x // TILE_SIZE)
-    end_col = min(len(tilemap[0]) if tilemap else 0, (camera_x + SCREEN_WIDTH) // TILE_SIZE + 1)
+    end_col = min(len(tilemap[0]) if tilemap else 0, (camera_x + view_w) // TILE_SIZE + 1)
     start_row = max(0, camera_y // TILE_SIZE)
-    end_row = min(len(tilemap), (camera_y + SCREEN_HEIGHT) // TILE_SIZE + 1)
+    end_row = min(len(tilemap), (camera_y + view_h) // TILE_SIZE + 1)
     
-    for row_idx in range(start_row, end_row):
-        row = tilemap[row_idx]
-        for col_idx in range(start_col, min(end_col, len(row))):
-            tile_idx = row[col_idx]
-            if 0 <= tile_idx < len(tiles):
-                surface.blit(tiles[tile_idx], (col_idx * TILE_SIZE - camera_x, row_idx * TILE_SIZE - camera_y))
-
-def draw_tilemap_multi(surface, tilemap, tilesets, camera_x=0, camera_y=0):
+    # Batch every tile into one Surface.blits call instead of a blit per tile.
+    # Column x positions are computed once and paired with each row slice by zip.
+    n_tiles = len(tiles)
+    step = TILE_SIZE
+    col_xs = range(start_col * step - camera_x, end_col * step - camera_x, step)
+    blit_seq = []
+    y_pos = start_row * step - camera_y
+    for row in tilemap[start_row:end_row]:
+        blit_seq.extend(
+            (tiles[tile_idx], (x_pos, y_pos))
+            for x_pos, tile_idx in zip(col_xs, row[start_col:end_col])
+            if 0 <= tile_idx < n_tiles
+        )
+        y_pos += step
+    surface.blits(blit_seq, doreturn=0)
+
+def transform_tile(tile, flags3):
+    """Return tile with Tiled's flip flags applied; flags3 is gid >> 29 (H=4, V=2, D=1)."""
+    # Apply Tiled flip/rotation flags using rotation-based mapping for R-rotations in Tiled:
+    # Tiled encodes 90/180/270 rotations as combinations of the diagonal flag with H/V.
+    # Common mapping (orthogonal):
+    #  - 0°:  d=0, h=0, v=0        -> rot=0,   no flips
+    #  - 90°: d=1, h=1, v=0        -> rot=-90 (90° CW), no flips
+    #  - 180°:d=0, h=1, v=1        -> rot=180, no flips
+    #  - 270°:d=1, h=0, v=1        -> rot=90  (90° CCW), no flips
+    #  - d=1 only (transpose): approximate as rot=90 CCW + H flip
+    h = bool(flags3 & 4)
+    v = bool(flags3 & 2)
+    rot = 0  # degrees CCW (pygame positive = CCW)
+    if flags3 & 1:
+        if h and not v:
+            # 90° CW
+            rot = 270  # CCW equivalent of -90
+            h = False
+            v = False
+        elif v and not h:
+            # 270° CW (90° CCW)
+            rot = 90
+            h = False
+            v = False
+        elif h and v:
+            # 180°
+            rot = 180
+            h = False
+            v = False
+        else:
+            # Only diagonal (transpose) -> 90° CCW + H flip
+            rot = 90
+            h = True
+            v = False
+    if rot:
+        tile = pygame.transform.rotate(tile, rot)
+    if h or v:
+        tile = pygame.transform.flip(tile, h, v)
+    return tile
+
+def _resolve_gid(gid, tilesets, firstgids):
+    """Return the (transformed) tile surface for a Tiled GID, or None if no tileset has it."""
+    base_gid = gid & GID_MASK
+    # Find tileset for gid: last tileset with firstgid <= base_gid
+    ts_idx = bisect_right(firstgids, base_gid) - 1
+    if ts_idx < 0:
+        return None
+    chosen = tilesets[ts_idx]
+    local_index = base_gid - chosen['firstgid']
+    if not 0 <= local_index < len(chosen['tiles']):
+        return None
+    # Top three GID bits are Tiled's H/V/D flags; the LUT holds each
+    # tile under all 8 flag combinations, built on first use
+    lut = chosen['transforms']
+    slot = (local_index << 3) | (gid >> 29)
+    tile_surf = lut[slot]
+    if tile_surf is None:
+        tile_surf = lut[slot] = transform_tile(chosen['tiles'][local_index], gid >> 29)
+    return tile_surf
+
+def draw_tilemap_multi(surface, tilemap, tilesets, camera_x=0, camera_y=0, cull_cache=None):
     """Draw a tilemap whose cells are Tiled GIDs using multiple tilesets.
 
-    tilesets: list of dicts [{'firstgid': int, 'tiles': [surfaces], 'name': str}], sorted by firstgid.
+    tilesets: list of dicts [{'firstgid': int, 'tiles': [surfaces], 'name': str, 'transforms': lut}],
+    sorted by firstgid. 'transforms' is a list of len(tiles) * 8 (see get_transform_lut).
+    cull_cache: optional dict owned by the caller (one per tilemap drawn every frame); the
+    culled tile list is kept there and reused until the visible tile range changes.
     """
     if not tilesets:
         print("[DEBUG] No tilesets provided to draw_tilemap_multi!")
         return
     
-    # Only draw tiles that are visible on screen
+    # Only draw tiles that are visible on the target surface
+    view_w, view_h = surface.get_size()
     start_col = max(0, camera_x // TILE_SIZE)
-    end_col = min(len(tilemap[0]) if tilemap else 0, (camera_x + SCREEN_WIDTH) // TILE_SIZE + 1)
+    end_col = min(len(tilemap[0]) if tilemap else 0, (camera_x + view_w) // TILE_SIZE + 1)
     start_row = max(0, camera_y // TILE_SIZE)
-    end_row = min(len(tilemap), (camera_y + SCREEN_HEIGHT) // TILE_SIZE + 1)
+    end_row = min(len(tilemap), (camera_y + view_h) // TILE_SIZE + 1)
     
-    # Cache for transformed tiles to avoid per-frame rotate/flip costs
-    # Keyed by (tiles_id, local_index, rot, flip_h, flip_v)
-    if not hasattr(draw_tilemap_multi, "_transform_cache"):
-        draw_tilemap_multi._transform_cache = {}
-    _transform_cache = draw_tilemap_multi._transform_cache
-
-    for row_idx in range(start_row, end_row):
-        row = tilemap[row_idx]
-        for col_idx in range(start_col, min(end_col, len(row))):
-            gid = row[col_idx]
-            if gid <= 0:
-                continue  # empty
-            # Extract Tiled flip/rotation flags and normalize GID
-            flipped_h = bool(gid & FLIPPED_HORIZONTALLY_FLAG)
-            flipped_v = bool(gid & FLIPPED_VERTICALLY_FLAG)
-            flipped_d = bool(gid & FLIPPED_DIAGONALLY_FLAG)
-            base_gid = gid & ~(FLIPPED_HORIZONTALLY_FLAG | FLIPPED_VERTICALLY_FLAG | FLIPPED_DIAGONALLY_FLAG)
-
-            # Find tileset for gid: last tileset with firstgid <= base_gid
-            chosen = None
-            for ts in tilesets:
-                if ts['firstgid'] <= base_gid:
-                    chosen = ts
-                else:
-                    break
-            if not chosen:
-                continue
-            local_index = base_gid - chosen['firstgid']
-            if 0 <= local_index < len(chosen['tiles']):
-                x_pos = col_idx * TILE_SIZE - camera_x
-                y_pos = row_idx * TILE_SIZE - camera_y
-
-                # Build a cached transformed surface based on Tiled flags
-                base_tile = chosen['tiles'][local_index]
-
-                # Apply Tiled flip/rotation flags using rotation-based mapping for R-rotations in Tiled:
-                # Tiled encodes 90/180/270 rotations as combinations of the diagonal flag with H/V.
-                # Common mapping (orthogonal):
-                #  - 0°:  d=0, h=0, v=0        -> rot=0,   no flips
-                #  - 90°: d=1, h=1, v=0        -> rot=-90 (90° CW), no flips
-                #  - 180°:d=0, h=1, v=1        -> rot=180, no flips
-                #  - 270°:d=1, h=0, v=1        -> rot=90  (90° CCW), no flips
-                #  - d=1 only (transpose): approximate as rot=90 CCW + H flip
-                h = flipped_h
-                v = flipped_v
-                rot = 0  # degrees CCW (pygame positive = CCW)
-                if flipped_d:
-                    if h and not v:
-                        # 90° CW
-                        rot = 270  # CCW equivalent of -90
-                        h = False
-                        v = False
-                    elif v and not h:
-                        # 270° CW (90° CCW)
-                        rot = 90
-                        h = False
-                        v = False
-                    elif h and v:
-                        # 180°
-                        rot = 180
-                        h = False
-                        v = False
-                    else:
-                        # Only diagonal (transpose) -> 90° CCW + H flip
-                        rot = 90
-                        h = True
-                        v = False
-
-                cache_key = (id(chosen['tiles']), local_index, rot, h, v)
-                tile_surf = _transform_cache.get(cache_key)
-                if tile_surf is None:
-                    tile_surf = base_tile
-                    if rot:
-                        tile_surf = pygame.transform.rotate(tile_surf, rot)
-                    if h or v:
-                        tile_surf = pygame.transform.flip(tile_surf, h, v)
-                    _transform_cache[cache_key] = tile_surf
-
-                surface.blit(tile_surf, (x_pos, y_pos))
+    # The camera moves in pixels but the culled range only changes when it crosses
+    # a tile boundary; until then reuse the tile list from the last call
+    cull_key = (start_col, start_row, end_col, end_row)
+    if cull_cache is not None and cull_cache.get('key') == cull_key:
+        blit_list = cull_cache['tiles']
+    else:
+        # Collect every visible tile (at map pixel positions) for one Surface.blits
+        # call; the list is sized for the whole view up front and trimmed to n afterwards
+        blit_list = [None] * (max(0, end_row - start_row) * max(0, end_col - start_col))
+        n = 0
+        # Each distinct GID is decoded once per call; repeats are a dict hit.
+        # Globals used in the loop are bound to locals, and y advances by a step.
+        firstgids = [ts['firstgid'] for ts in tilesets]
+        resolved = {}
+        resolve = _resolve_gid
+        step = TILE_SIZE
+        col_xs = range(start_col * step, end_col * step, step)
+        y_pos = start_row * step
+        for row in tilemap[start_row:end_row]:
+            for x_pos, gid in zip(col_xs, row[start_col:end_col]):
+                if gid <= 0:
+                    continue  # empty
+                try:
+                    tile_surf = resolved[gid]
+                except KeyError:
+                    tile_surf = resolved[gid] = resolve(gid, tilesets, firstgids)
+                if tile_surf is not None:
+                    blit_list[n] = (tile_surf, (x_pos, y_pos))
+                    n += 1
+            y_pos += step
+        del blit_list[n:]
+        if cull_cache is not None:
+            cull_cache['key'] = cull_key
+            cull_cache['tiles'] = blit_list
+    if camera_x or camera_y:
+        surface.blits([(tile_surf, (x - camera_x, y - camera_y)) for tile_surf, (x, y) in blit_list], doreturn=0)
+    else:
+        surface.blits(blit_list, doreturn=0)
+
+TILE_BLOCK = 8  # Block edge (tiles) for draw_layers_multi's traversal
+BAKE_PAGE = 256  # Page edge (px) of baked layer surfaces
+
+def draw_layers_multi(surface, layer_maps, tilesets, camera_x=0, camera_y=0):
+    """Draw several same-sized GID layers (bottom first) in one blits call.
+
+    The visible window is walked in TILE_BLOCK x TILE_BLOCK blocks, drawing every
+    layer's cells for a block before moving on, so each block's rows are read
+    back to back across layers. Tiles never overlap neighbouring cells, so the
+    result matches drawing the layers one after another.
+    """
+    if not tilesets or not layer_maps or not layer_maps[0]:
+        return
+    view_w, view_h = surface.get_size()
+    rows = len(layer_maps[0])
+    cols = len(layer_maps[0][0])
+    start_col = max(0, camera_x // TILE_SIZE)
+    end_col = min(cols, (camera_x + view_w) // TILE_SIZE + 1)
+    start_row = max(0, camera_y // TILE_SIZE)
+    end_row = min(rows, (camera_y + view_h) // TILE_SIZE + 1)
+
+    firstgids = [ts['firstgid'] for ts in tilesets]
+    resolved = {}
+    resolve = _resolve_gid
+    step = TILE_SIZE
+    blit_list = []
+    append = blit_list.append
+    for block_row in range(start_row, end_row, TILE_BLOCK):
+        block_row_end = min(end_row, block_row + TILE_BLOCK)
+        block_y = block_row * step - camera_y
+        for block_col in range(start_col, end_col, TILE_BLOCK):
+            block_col_end = min(end_col, block_col + TILE_BLOCK)
+            col_xs = range(block_col * step - camera_x, block_col_end * step - camera_x, step)
+            for layer_map in layer_maps:
+                y_pos = block_y
+                for row in layer_map[block_row:block_row_end]:
+                    for x_pos, gid in zip(col_xs, row[block_col:block_col_end]):
+                        if gid <= 0:
+                            continue  # empty
+                        try:
+                            tile_surf = resolved[gid]
+                        except KeyError:
+                            tile_surf = resolved[gid] = resolve(gid, tilesets, firstgids)
+                        if tile_surf is not None:
+                            append((tile_surf, (x_pos, y_pos)))
+                    y_pos += step
+    surface.blits(blit_list, doreturn=0)
+
+def to_tile_rows(tilemap):
+    """Copy a 2D list of tile ids/GIDs into one packed int64 array per row."""
+    return [array('q', row) for row in tilemap]
+
+# Cache for object pixel sizes, keyed by (id(object_defs), object_name, scale)
+_OBJ_SIZE_CACHE = {}
+
+def get_object_rect(object_name, x, y, object_defs, scale=1):
+    """Compute the object's bounding rect based on its definition and scale."""
+    scale = max(1, int(scale))
+    key = (id(object_defs), object_name, scale)
+    size = _OBJ_SIZE_CACHE.get(key)
+    if size is None:
+        obj = object_defs.get(object_name)
+        if not obj:
+            return pygame.Rect(x, y, 0, 0)
+        height_tiles = len(obj)
+        width_tiles = max((len(row) for row in obj), default=0)
+        size = (width_tiles * TILE_SIZE * scale, height_tiles * TILE_SIZE * scale)
+        _OBJ_SIZE_CACHE[key] = size
+    return pygame.Rect(x, y, size[0], size[1])
 
 # --- SCENE MANAGEMENT SYSTEM ---
+_GRID_BIT_CHARS = bytes.maketrans(b'\x00\x01', b'01')  # collision grid bytes -> binary digits
+SOLID_GRID_CELL = 64  # Cell size (px) of the broad-phase grid for solid objects
+
+class SceneObject:
+    """Runtime state of one placed object; built once from its scenes.json dict."""
+    __slots__ = ('name', 'x', 'y', 'scale', 'visible', 'solid', 'interactive', 'toggleKey', 'portal', 'radius', 'radius_sq', 'rect')
+
+    def __init__(self, data, object_defs):
+        """
+        Args:
+            data: Object dict from the scene JSON ('name', 'x', 'y' plus optional flags)
+            object_defs: Object definitions for the scene's tileset (used for the rect)
+        """
+        self.name = data['name']
+        self.x = data['x']
+        self.y = data['y']
+        self.scale = max(1, int(data.get('scale', 1)))
+        self.visible = data.get('visible', True)
+        self.solid = data.get('solid', False)
+        self.interactive = data.get('interactive', False)
+        # Normalize toggleKey to lowercase for comparison
+        toggle_key = data.get('toggleKey')
+        self.toggleKey = toggle_key.lower() if isinstance(toggle_key, str) else toggle_key
+        self.portal = data.get('portal')
+        self.radius = data.get('radius', 60)
+        self.radius_sq = self.radius * self.radius  # Interaction range compared against squared distance
+        self.rect = get_object_rect(self.name, self.x, self.y, object_defs, self.scale)
+
 class Scene:
-    def __init__(self, name, tileset_name, tilemap, objects=None, items=None, tilesets_info=None, min_x=0, min_y=0, layers=None, layer_names=None, layer_props=None):
+    def __init__(self, name, tileset_name, tilemap, objects=None, items=None, tilesets_info=None, min_x=0, min_y=0, layers=None, layer_names=None, layer_props=None, object_defs_by_tileset=None):
         """
         Create a scene with its own tileset, tilemap, and objects.
         
@@ -191,18 +360,25 @@ class Scene:
             name: Scene identifier (e.g., "overworld", "cave", "house")
             tileset_name: Name of the tileset PNG file (without extension)
             tilemap: 2D array of tile indices
-            objects: List of dicts with 'name', 'x', 'y' for objects to draw
+            objects: List of dicts with 'name', 'x', 'y' for objects to draw (stored as SceneObjects)
             items: List of dicts with 'type', 'x', 'y' for item pickups
+            object_defs_by_tileset: Object definitions used to precompute object rects and draw objects
         """
         self.name = name
         self.tileset_name = tileset_name
         self.tilesets_info = tilesets_info or []  # [{'name','firstgid'}] for multi-tileset scenes
-        self.tilemap = tilemap  # Composite/flattened tilemap (for sizing, fallback draw)
-        self.layers = layers or []  # Optional list of per-layer tilemaps
+        # Rows are stored as packed arrays (see to_tile_rows) rather than lists of int objects
+        self.tilemap = to_tile_rows(tilemap) if tilemap else tilemap  # Composite/flattened tilemap (for sizing, fallback draw)
+        self.layers = [to_tile_rows(layer) for layer in (layers or [])]  # Optional list of per-layer tilemaps
         self.min_x = min_x
         self.min_y = min_y
         self.layer_names = layer_names or []
         self.layer_props = layer_props or []
+        # Map size in tiles and pixels (fixed for the scene's lifetime; read every frame for the camera)
+        self.rows = len(tilemap) if tilemap else 0
+        self.cols = len(tilemap[0]) if self.rows else 0
+        self.pixel_width = self.cols * TILE_SIZE if tilemap else SCREEN_WIDTH
+        self.pixel_height = self.rows * TILE_SIZE if tilemap else SCREEN_HEIGHT
         if self.tilesets_info:
             # Multi-tileset scene: load all referenced tilesets
             loaded = []
@@ -211,7 +387,8 @@ class Scene:
                 if not name:
                     continue
                 tiles = load_tileset(name)
-                loaded.append({'name': name, 'firstgid': tsi.get('firstgid', 1), 'tiles': tiles})
+                loaded.append({'name': name, 'firstgid': tsi.get('firstgid', 1), 'tiles': tiles,
+                               'transforms': get_transform_lut(tiles)})
             self._tilesets_loaded = loaded
             self.tiles = None
         else:
@@ -219,14 +396,18 @@ class Scene:
             self.tiles = load_tileset(tileset_name)
             self._tilesets_loaded = None
         # Initialize objects with runtime state (e.g., visibility)
-        self.objects = []
-        for obj in (objects or []):
-            o = dict(obj)
-            o.setdefault('visible', True)
-            # normalize toggle key to lowercase string if provided
-            if 'toggleKey' in o and isinstance(o['toggleKey'], str):
-                o['toggleKey'] = o['toggleKey'].lower()
-            self.objects.append(o)
+        # Object definitions and tiles for this scene's tileset, resolved once for draw()
+        self._obj_defs = (object_defs_by_tileset or {}).get(tileset_name, {})
+        self._object_tiles = self._tilesets_loaded[0]['tiles'] if self._tilesets_loaded else self.tiles
+        self.objects = [SceneObject(obj, self._obj_defs) for obj in (objects or [])]
+        # Pre-filtered views for the per-frame loops (membership never changes;
+        # 'visible' is still checked where it matters)
+        self.solids = [o for o in self.objects if o.solid]
+        self.interactives = [o for o in self.objects if o.interactive]
+        self.portals = [o for o in self.objects if o.portal]
+        # Rect lists for the frame loop's collidelist probes (see refresh_visibility)
+        self.visibility_version = 0
+        self.refresh_visibility()
         # Track per-scene items and their collected state
         self.items = []
         for it in (items or []):
@@ -234,16 +415,114 @@ class Scene:
             item = dict(it)
             item.setdefault('collected', False)
             self.items.append(item)
-        # Build a collision grid from any layers marked for collision
+        # Build a collision grid from any layers marked for collision (empty list if none)
         self._collision_grid = self._build_collision_grid()
+        # Same grid as one int bitmask per row (bit c = column c) for span queries
+        self._collision_bits = [int(row[::-1].translate(_GRID_BIT_CHARS), 2) for row in self._collision_grid]
+        # Static tiles never change at runtime, so render them once into baked
+        # surfaces and blit those each frame (see rebake)
+        self._baked_layers = []
+        self.dirty = True
+        self.rebake()
+
+    def rebake(self):
+        """
+        Render the static tile layers into self._baked_layers. Call again (or set dirty) after editing tiles.
+
+        Consecutive static layers are baked together into a grid of
+        BAKE_PAGE x BAKE_PAGE pages; Scene.draw blits only the pages in view.
+        Layers whose layer_props set 'animated' are not baked; they are drawn per
+        frame in their place in the stack.
+        """
+        size = (max(1, self.cols * TILE_SIZE), max(1, self.rows * TILE_SIZE))
+        self._page_size = (BAKE_PAGE, BAKE_PAGE)
+        # Each entry is (pages, None, None) or (None, live_layer_map, cull_cache), in draw order;
+        # pages[py][px] is a baked surface, or None where the page has no tiles
+        self._baked_layers = []
+        static_run = []
+        layer_maps = self.layers or ([self.tilemap] if self.tilemap else [])
+        for i, layer_map in enumerate(layer_maps):
+            props = self.layer_props[i] if self.layers and i < len(self.layer_props) else None
+            if props and props.get('animated'):
+                self._bake_run(static_run, size)
+                static_run = []
+                self._baked_layers.append((None, layer_map, {}))
+            else:
+                static_run.append(layer_map)
+        self._bake_run(static_run, size)
+        self.dirty = False
+
+    def _bake_run(self, layer_maps, size):
+        if not layer_maps:
+            return
+        page_w, page_h = self._page_size
+        pages = []
+        for page_y in range(0, size[1], page_h):
+            row = []
+            for page_x in range(0, size[0], page_w):
+                page = pygame.Surface((min(page_w, size[0] - page_x), min(page_h, size[1] - page_y)),
+                                      pygame.SRCALPHA).convert_alpha()
+                # Draw with the page origin as the camera; the helpers cull to the page
+                if self._tilesets_loaded:
+                    # All layers of the run in one block-ordered pass
+                    draw_layers_multi(page, layer_maps, self._tilesets_loaded, page_x, page_y)
+                else:
+                    for layer_map in layer_maps:
+                        draw_tilemap_single(page, layer_map, self.tiles, page_x, page_y)
+                # Fully transparent pages are skipped at draw time
+                row.append(page if page.get_bounding_rect().width else None)
+            pages.append(row)
+        self._baked_layers.append((pages, None, None))
+
+    def _draw_layer(self, surface, layer_map, camera_x=0, camera_y=0, cull_cache=None):
+        if self._tilesets_loaded:
+            draw_tilemap_multi(surface, layer_map, self._tilesets_loaded, camera_x, camera_y, cull_cache)
+        else:
+            draw_tilemap_single(surface, layer_map, self.tiles, camera_x, camera_y)
+
+    def refresh_visibility(self):
+        """Rebuild the visibility-dependent rect lists. Call after toggling an object's 'visible'."""
+        # Bumped on every change so the renderer knows the drawn objects changed
+        self.visibility_version += 1
+        visible_solids = [o for o in self.solids if o.visible]
+        # Uniform grid broad phase for solid objects: (cell_x, cell_y) -> [rect]
+        self._solid_grid = self._build_solid_grid(visible_solids)
+        # Portals only trigger while their door is open (invisible)
+        self._open_portals = [o for o in self.portals if not o.visible]
+        self._open_portal_rects = [o.rect for o in self._open_portals]
+
+    def _build_solid_grid(self, solids):
+        grid = {}
+        for o in solids:
+            r = o.rect
+            for cy in range(r.top // SOLID_GRID_CELL, (r.bottom - 1) // SOLID_GRID_CELL + 1):
+                for cx in range(r.left // SOLID_GRID_CELL, (r.right - 1) // SOLID_GRID_CELL + 1):
+                    grid.setdefault((cx, cy), []).append(r)
+        return grid
+
+    def collides_rect_with_solids(self, rect):
+        """True if rect overlaps a visible solid object (grid cells under rect, collidelist per cell)."""
+        if not self._solid_grid:
+            return False
+        for cy in range(rect.top // SOLID_GRID_CELL, (rect.bottom - 1) // SOLID_GRID_CELL + 1):
+            for cx in range(rect.left // SOLID_GRID_CELL, (rect.right - 1) // SOLID_GRID_CELL + 1):
+                cell = self._solid_grid.get((cx, cy))
+                if cell and rect.collidelist(cell) != -1:
+                    return True
+        return False
+
+    def portal_at_rect(self, rect):
+        """Return the first open portal object overlapping rect, or None."""
+        hit = rect.collidelist(self._open_portal_rects)
+        return self._open_portals[hit] if hit != -1 else None
 
     def _build_collision_grid(self):
         if not self.layers or not self.tilemap:
-            return None
+            return []
         height = len(self.tilemap)
         width = len(self.tilemap[0]) if height > 0 else 0
         if width == 0:
-            return None
+            return []
         # Determine which layer indices are collision layers (by name keyword or property 'collision'==True)
         chosen = set()
         for i, name in enumerate(self.layer_names or []):
@@ -256,18 +535,17 @@ class Scene:
             if is_collision:
                 chosen.add(i)
         if not chosen:
-            return None
-        grid = [[False for _ in range(width)] for _ in range(height)]
+            return []
+        # One bytearray per row (1 = solid). Each layer row becomes 0/1 bytes in C
+        # (bytes(map(bool, ...))); read little-endian as an int, byte c is column c,
+        # so OR-ing the ints merges the collision layers a whole row at a time.
+        merged = [0] * height
         for i in chosen:
             if i >= len(self.layers):
                 continue
-            layer_map = self.layers[i]
-            for r in range(min(height, len(layer_map))):
-                row = layer_map[r]
-                for c in range(min(width, len(row))):
-                    if row[c]:
-                        grid[r][c] = True
-        return grid
+            for r, row in enumerate(self.layers[i][:height]):
+                merged[r] |= int.from_bytes(bytes(map(bool, row[:width])), 'little')
+        return [bytearray(value.to_bytes(width, 'little')) for value in merged]
 
     def is_solid_at_tile(self, tx, ty):
         if not self._collision_grid:
@@ -276,7 +554,7 @@ class Scene:
             return False
         if ty >= len(self._collision_grid) or tx >= len(self._collision_grid[0]):
             return False
-        return self._collision_grid[ty][tx]
+        return bool(self._collision_grid[ty][tx])
 
     def collides_rect_with_tiles(self, rect):
         if not self._collision_grid:
@@ -285,47 +563,84 @@ class Scene:
         start_ty = max(0, rect.top // TILE_SIZE)
         end_tx = min(len(self._collision_grid[0]) - 1, (rect.right - 1) // TILE_SIZE)
         end_ty = min(len(self._collision_grid) - 1, (rect.bottom - 1) // TILE_SIZE)
+        if start_tx > end_tx:
+            return False
+        # Test the covered column span of each row with one shift-and-mask
+        span_mask = (1 << (end_tx - start_tx + 1)) - 1
+        bits = self._collision_bits
         for ty in range(start_ty, end_ty + 1):
-            for tx in range(start_tx, end_tx + 1):
-                if self._collision_grid[ty][tx]:
-                    return True
+            if (bits[ty] >> start_tx) & span_mask:
+                return True
         return False
     
-    def draw(self, surface, object_defs_by_tileset, camera_x=0, camera_y=0):
+    def draw(self, surface, camera_x=0, camera_y=0):
         """Draw the scene's tilemap and objects with camera offset."""
-        if self._tilesets_loaded:
-            if self.layers:
-                # Draw each layer in order so decorations appear on top
-                for layer_map in self.layers:
-                    draw_tilemap_multi(surface, layer_map, self._tilesets_loaded, camera_x, camera_y)
+        if self.dirty:
+            self.rebake()
+        # Draw each layer in order so decorations appear on top. Only baked pages
+        # that intersect the view are blitted; pygame clips their edges.
+        page_w, page_h = self._page_size
+        view_w, view_h = surface.get_size()
+        first_px = max(0, camera_x // page_w)
+        last_px = (camera_x + view_w - 1) // page_w
+        first_py = max(0, camera_y // page_h)
+        last_py = (camera_y + view_h - 1) // page_h
+        for pages, layer_map, cull_cache in self._baked_layers:
+            if pages is not None:
+                for py in range(first_py, min(last_py + 1, len(pages))):
+                    row = pages[py]
+                    for px in range(first_px, min(last_px + 1, len(row))):
+                        page = row[px]
+                        if page is not None:
+                            surface.blit(page, (px * page_w - camera_x, py * page_h - camera_y))
             else:
-                draw_tilemap_multi(surface, self.tilemap, self._tilesets_loaded, camera_x, camera_y)
-        else:
-            if self.layers:
-                for layer_map in self.layers:
-                    draw_tilemap_single(surface, layer_map, self.tiles, camera_x, camera_y)
-            else:
-                draw_tilemap_single(surface, self.tilemap, self.tiles, camera_x, camera_y)
-        # Select object definitions for this scene's tileset
-        obj_defs = object_defs_by_tileset.get(self.tileset_name, {})
-        # Use the appropriate tiles for drawing objects
-        tiles_for_objects = self._tilesets_loaded[0]['tiles'] if self._tilesets_loaded else self.tiles
+                self._draw_layer(surface, layer_map, camera_x, camera_y, cull_cache)
+        obj_defs = self._obj_defs
+        tiles_for_objects = self._object_tiles
         for obj in self.objects:
-            if obj.get('visible', True):
+            if obj.visible:
                 draw_object(
                     surface,
-                    obj['name'],
-                    obj['x'] - camera_x,
-                    obj['y'] - camera_y,
+                    obj.name,
+                    obj.x - camera_x,
+                    obj.y - camera_y,
                     tiles_for_objects,
                     obj_defs,
-                    scale=max(1, int(obj.get('scale', 1)))
+                    scale=obj.scale
                 )
 
-def load_scenes_from_json(filepath):
+def _parse_json_file(path):
+    """Parse a JSON file with orjson when it is installed, else the json module."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _load_cached_json(path):
+    """Load a JSON file through a pickle cache kept next to it (path + '.pkl').
+
+    The cache is used while it is at least as new as the JSON file and is
+    rewritten otherwise; any cache problem falls back to parsing the JSON.
+    """
+    cache_path = path + '.pkl'
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+    except Exception:
+        pass  # Missing, stale or unreadable cache
+    data = _parse_json_file(path)
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        print(f"[DEBUG] Could not write cache {cache_path}: {e}")
+    return data
+
+def load_scenes_from_json(filepath, object_defs_by_tileset=None):
     """Load all scenes from a JSON file."""
-    with open(filepath, 'r') as f:
-        scenes_data = json.load(f)
+    scenes_data = _load_cached_json(filepath)
     
     scenes = {}
     for scene_name, scene_info in scenes_data.items():
@@ -338,12 +653,16 @@ def load_scenes_from_json(filepath):
             tilesets_info=scene_info.get('tilesets'),
             layers=scene_info.get('layers'),
             layer_names=scene_info.get('layer_names'),
-            layer_props=scene_info.get('layer_props')
+            layer_props=scene_info.get('layer_props'),
+            object_defs_by_tileset=object_defs_by_tileset
         )
     return scenes
 
+# Load object definitions grouped by tileset from JSON (scenes resolve object rects from these)
+object_defs_by_tileset = _load_cached_json(os.path.join('Tilesets', 'objects.json'))
+
 # Load scenes from JSON
-scenes = load_scenes_from_json(os.path.join('Tilesets', 'scenes.json'))
+scenes = load_scenes_from_json(os.path.join('Tilesets', 'scenes.json'), object_defs_by_tileset)
  
 # --- OPTIONAL: Load additional scenes directly from Tiled maps in Maps/ ---
 def _normalize_tileset_name(name: str) -> str:
@@ -376,8 +695,9 @@ def _load_tiled_maps_into_scenes(maps_dir: str):
             continue
         fpath = os.path.join(maps_dir, fname)
         try:
-            # Parse tiled data
-            tiled_data = tc.parse_json(fpath)
+            # Parse tiled data, packing each GID list as soon as it is parsed so
+            # the boxed int lists can be freed before the scene is built
+            tiled_data = _parse_json_file(fpath)
             # Detect tileset name from Tiled (first tileset) and normalize to actual PNG name
             detected = None
             if isinstance(tiled_data, dict):
@@ -405,7 +725,8 @@ def _load_tiled_maps_into_scenes(maps_dir: str):
                         min_x = min((c['x'] for c in layer['chunks']), default=0)
                         min_y = min((c['y'] for c in layer['chunks']), default=0)
                         break
-            scenes[scene_name] = Scene(
+            del tiled_data  # Only scene_dict is needed from here on
+            scene = scenes[scene_name] = Scene(
                 name=scene_name,
                 tileset_name=scene_dict.get('tileset', tileset_name),
                 tilemap=scene_dict['tilemap'],
@@ -416,13 +737,16 @@ def _load_tiled_maps_into_scenes(maps_dir: str):
                 min_y=min_y,
                 layers=scene_dict.get('layers'),
                 layer_names=scene_dict.get('layer_names'),
-                layer_props=scene_dict.get('layer_props')
+                layer_props=scene_dict.get('layer_props'),
+                object_defs_by_tileset=object_defs_by_tileset
             )
+            del scene_dict  # Scene keeps packed copies of the rows; drop the boxed lists
             # Debug: Count non-empty tiles
-            non_empty = sum(1 for row in scene_dict['tilemap'] for tile in row if tile > 0)
-            total = len(scene_dict['tilemap']) * len(scene_dict['tilemap'][0]) if scene_dict['tilemap'] else 0
+            tilemap = scene.tilemap or []
+            non_empty = sum(1 for row in tilemap for tile in row if tile > 0)
+            total = len(tilemap) * len(tilemap[0]) if tilemap else 0
             print(f"[DEBUG] Loaded Tiled scene '{scene_name}' (tileset='{tileset_name}') from {fname}")
-            print(f"[DEBUG] Map size: {len(scene_dict['tilemap'][0]) if scene_dict['tilemap'] else 0}x{len(scene_dict['tilemap'])} tiles, {non_empty}/{total} non-empty")
+            print(f"[DEBUG] Map size: {len(tilemap[0]) if tilemap else 0}x{len(tilemap)} tiles, {non_empty}/{total} non-empty")
         except Exception as e:
             print(f"[DEBUG] Failed to import Tiled map {fname}: {e}")
 
@@ -437,24 +761,31 @@ current_scene = scenes.get('cave_1', scenes.get('cave'))
 
 # Create a simple inventory system
 class Inventory:
-    def __init__(self):
+    def __init__(self, item_images=None):
         self.items = []
         self.visible = False  # Track if inventory is visible
         self.slot_size = 40
         self.slot_margin = 4
         self.slot_color = (64, 64, 64)  # Dark gray
         self.slot_border = (128, 128, 128)  # Light gray
-        self.background = pygame.Surface((self.slot_size, self.slot_size))
+        self.background = pygame.Surface((self.slot_size, self.slot_size)).convert()
         self.background.fill(self.slot_color)
         # Draw border
         pygame.draw.rect(self.background, self.slot_border, 
                         (0, 0, self.slot_size, self.slot_size), 2)
+        # Item images pre-scaled to fit a slot, keyed like ITEM_IMAGES
+        self._scaled_items = {
+            key: pygame.transform.scale(img, (self.slot_size - 8, self.slot_size - 8)).convert_alpha()
+            for key, img in (item_images or {}).items()
+        }
 
     def add_item(self, item):
         self.items.append(item)
         print(f"Picked up: {item}")  # Simple notification when item is picked up
 
-    def draw(self, screen, item_image):
+    def draw(self, screen, item_key):
+        # Slot-sized image scaled in __init__
+        scaled_item = self._scaled_items[item_key]
         # Draw inventory slots in top-left corner
         for i in range(max(3, len(self.items))):  # Always show at least 3 slots
             slot_x = 10 + (self.slot_size + self.slot_margin) * i
@@ -463,9 +794,6 @@ class Inventory:
             screen.blit(self.background, (slot_x, slot_y))
             # If this slot has an item, draw the item
             if i < len(self.items):
-                # Scale the item image to fit in the slot
-                scaled_item = pygame.transform.scale(item_image, 
-                    (self.slot_size - 8, self.slot_size - 8))
                 # Center the item in the slot
                 item_x = slot_x + 4
                 item_y = slot_y + 4
@@ -486,13 +814,27 @@ class Inventory:
 #             durations.append(gif.info['duration'] if 'duration' in gif.info else 100)
 #     return frames, durations
 
+def _now_ms():
+    """Monotonic clock in integer milliseconds, used for all animation timing."""
+    # SDL's tick counter is already an int in ms; no float or division per read
+    return pygame.time.get_ticks()
+
+# Loaded sheets by absolute (json, png) path. Several animation keys (and every
+# enemy of a type) use the same sheet, so they share one frame list; callers
+# must not mutate the returned lists.
+_SPRITESHEET_CACHE = {}
+
 def load_spritesheet_frames(json_path, png_path):
     """Load Aseprite JSON Array format sprite sheet with frame durations."""
+    cache_key = (os.path.abspath(json_path), os.path.abspath(png_path))
+    cached = _SPRITESHEET_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     frames = []
     durations = []
     
     # Load JSON metadata
-    with open(json_path, 'r') as f:
+    with open(json_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
     # Load the sprite sheet PNG
@@ -503,15 +845,27 @@ def load_spritesheet_frames(json_path, png_path):
         frame_rect = frame_data['frame']
         x, y, w, h = frame_rect['x'], frame_rect['y'], frame_rect['w'], frame_rect['h']
         
-        # Create a surface for this frame
-        frame_surface = pygame.Surface((w, h), pygame.SRCALPHA)
-        frame_surface.blit(sheet, (0, 0), (x, y, w, h))
+        # Copy this frame's pixels straight out of the sheet (already in display
+        # format, so blits don't convert per pixel; no intermediate blend pass)
+        frame_surface = sheet.subsurface((x, y, w, h)).copy()
         
         frames.append(frame_surface)
         durations.append(frame_data.get('duration', 100))
     
+    _SPRITESHEET_CACHE[cache_key] = (frames, durations)
     return frames, durations
 
+class Animation:
+    """Frames, per-frame durations (ms) and playback state of one player animation."""
+    __slots__ = ('frames', 'durations', 'current_frame', 'last_update', 'loop')
+
+    def __init__(self, frames, durations, loop=True):
+        self.frames = frames
+        self.durations = durations
+        self.current_frame = 0
+        self.last_update = _now_ms()
+        self.loop = loop
+
 # Load all Lvl_1 character animations
 PLAYER_SCALE = 1.2  # Increase to make the player bigger (was 0.6)
 animation_data = {}
@@ -544,13 +898,7 @@ for anim_key, (folder_name, direction) in lvl1_animation_map.items():
     
     if os.path.exists(json_path) and os.path.exists(png_path):
         frames, durations = load_spritesheet_frames(json_path, png_path)
-        animation_data[anim_key] = {
-            'frames': frames,
-            'durations': durations,
-            'current_frame': 0,
-            'last_update': time.time() * 1000,  # ms
-            'loop': True
-        }
+        animation_data[anim_key] = Animation(frames, durations, loop=True)
     else:
         print(f"[WARNING] Missing animation: {json_path} or {png_path}")
 
@@ -561,13 +909,7 @@ def _maybe_add_spritesheet_animation(key, folder_name, direction, loop=False):
     
     if os.path.exists(json_path) and os.path.exists(png_path):
         frames, durations = load_spritesheet_frames(json_path, png_path)
-        animation_data[key] = {
-            'frames': frames,
-            'durations': durations,
-            'current_frame': 0,
-            'last_update': time.time() * 1000,
-            'loop': loop
-        }
+        animation_data[key] = Animation(frames, durations, loop=loop)
 
 # Load combat animations (attacks)
 _maybe_add_spritesheet_animation('attack1_east', 'Attack', 'East', loop=False)
@@ -600,6 +942,13 @@ for direction in ['east', 'west', 'north', 'south']:
 last_facing_direction = 'east'  # Default facing direction (now supports all 4 directions)
 last_horizontal_direction = 'east'  # Track last horizontal direction for diagonal movement
 
+# Movement animation key by (is_running, direction), so the loop doesn't build strings per frame
+_ANIM_LOOKUP = {
+    (running, direction): ('run_' if running else '') + direction
+    for running in (False, True)
+    for direction in ('east', 'west', 'north', 'south')
+}
+
 # Attack state
 is_attacking = False
 current_attack = None  # e.g., 'attack1_east', 'shot1_west'
@@ -617,30 +966,38 @@ HEALTH_BAR_BORDER = 2
 
 
 # Scale animation frames if needed (before creating the player's rect)
+# Scaled copies by (id(frames), scale), so animations sharing a sheet share its scaled frames too
+_SCALED_FRAMES_CACHE = {}
+
 def _scale_frames(frames, scale):
     if abs(scale - 1.0) < 1e-6:
         return frames
+    key = (id(frames), scale)
+    cached = _SCALED_FRAMES_CACHE.get(key)
+    if cached is not None:
+        return cached
     scaled = []
     for f in frames:
         w, h = f.get_width(), f.get_height()
         new_size = (max(1, int(w * scale)), max(1, int(h * scale)))
-        scaled.append(pygame.transform.scale(f, new_size))
+        scaled.append(pygame.transform.scale(f, new_size).convert_alpha())
+    _SCALED_FRAMES_CACHE[key] = scaled
     return scaled
 
 if PLAYER_SCALE and abs(PLAYER_SCALE - 1.0) > 1e-6:
     for direction, data in animation_data.items():
-        data['frames'] = _scale_frames(data['frames'], PLAYER_SCALE)
+        data.frames = _scale_frames(data.frames, PLAYER_SCALE)
     # Also scale the facing images
     for direction in facing_images:
         img = facing_images[direction]
         w, h = img.get_width(), img.get_height()
         new_size = (max(1, int(w * PLAYER_SCALE)), max(1, int(h * PLAYER_SCALE)))
-        facing_images[direction] = pygame.transform.scale(img, new_size)
+        facing_images[direction] = pygame.transform.scale(img, new_size).convert_alpha()
 
 # Movement speed (reduce this number to move slower)
 
 def draw_health_bar(surface, x, y, current_hp, max_hp, width, height, border=2):
-    """Draw a health bar with gradient color based on HP percentage."""
+    """Draw a health bar with gradient color based on HP percentage. Returns the outer rect drawn."""
     # Calculate HP percentage
     hp_percent = max(0, min(1, current_hp / max_hp))
     
@@ -676,6 +1033,7 @@ def draw_health_bar(surface, x, y, current_hp, max_hp, width, height, border=2):
     # Draw border (white)
     border_rect = pygame.Rect(x - border, y - border, width + border * 2, height + border * 2)
     pygame.draw.rect(surface, (255, 255, 255), border_rect, border)
+    return border_rect
 
 PLAYER_SPEED = 2
 PLAYER_RUN_SPEED = 4  # Running is faster than walking
@@ -685,7 +1043,7 @@ COLLISION_MARGIN = 0  # Pixels to shrink the player hitbox for more forgiving co
 
 # Start with static animation
 current_animation = 'static'
-player = animation_data[current_animation]['frames'][0].get_rect()
+player = animation_data[current_animation].frames[0].get_rect()
 # Set the initial position (center of screen, will be adjusted for map offset)
 player.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
 
@@ -714,9 +1072,14 @@ FRAME_RATE = 60
 ARROW_AMPLITUDE = 10  # How many pixels up and down
 ARROW_SPEED = 0.005  # Speed of bounce
 arrow_base_y = 30  # Distance above the item
+# One sine period of bounce offsets; indexed by the bounce phase instead of calling math.sin
+ARROW_LUT_SIZE = 256
+_ARROW_BOB_LUT = [math.sin(2 * math.pi * i / ARROW_LUT_SIZE) * ARROW_AMPLITUDE for i in range(ARROW_LUT_SIZE)]
+_ARROW_PHASE_SCALE = ARROW_SPEED * ARROW_LUT_SIZE / (2 * math.pi)  # ms -> LUT steps
+_ARROW_PTS = [[0, 0], [0, 0], [0, 0]]  # Indicator triangle, rewritten in place for each item
 
 # Load item images (extendable for more item types)
-sword_image = pygame.image.load(os.path.join('Items', 'sword.png'))
+sword_image = pygame.image.load(os.path.join('Items', 'sword.png')).convert_alpha()
 # Optional scaling example:
 # sword_image = pygame.transform.scale(sword_image, (32, 32))
 ITEM_IMAGES = {
@@ -724,7 +1087,15 @@ ITEM_IMAGES = {
 }
 
 # Create inventory
-inventory = Inventory()
+inventory = Inventory(ITEM_IMAGES)
+# Semi-transparent backdrop shown while the inventory is open (allocated once)
+_INV_OVERLAY = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+_INV_OVERLAY.fill((0, 0, 0))
+_INV_OVERLAY.set_alpha(128)  # 128 for 50% transparency
+
+# Debug overlay (F5) font, loaded once; rendered lines are reused until their text changes
+DEBUG_FONT = pygame.font.Font(None, 24)
+_debug_line_surfs = {}  # line index -> (text, rendered surface)
 
 
 # ==================== ENEMY SYSTEM ====================
@@ -743,7 +1114,7 @@ class Enemy:
         self.is_dead = False
         self.current_animation = 'idle'
         self.current_frame = 0
-        self.last_update = time.time() * 1000
+        self.last_update = _now_ms()
         self.attack_cooldown = 0  # ms until can attack again
         self.hurt_timer = 0  # Duration of hurt animation
         self.death_timer = 0  # Duration of death animation
@@ -830,8 +1201,8 @@ class Enemy:
             return 5  # Damage amount
         return 0
 
-    def update(self, dt):
-        """Update enemy state and animation"""
+    def update(self, dt, current_time=None):
+        """Update enemy state and animation (current_time: frame timestamp from _now_ms)"""
         if self.is_dead:
             if self.death_timer > 0:
                 self.death_timer -= dt
@@ -861,7 +1232,8 @@ class Enemy:
             anim_key = 'idle'
         
         # Update animation frame
-        current_time = time.time() * 1000
+        if current_time is None:
+            current_time = _now_ms()
         anim = self.animations[anim_key]
         
         # Reset frame if out of bounds (happens when switching animations)
@@ -888,16 +1260,17 @@ class Enemy:
         self.current_animation = anim_key
     
     def draw(self, surface, camera_x, camera_y):
-        """Draw the enemy"""
+        """Draw the enemy. Returns the screen rect drawn (None if nothing was drawn)."""
         if self.is_dead and self.death_timer <= 0:
-            return  # Don't draw if fully dead
+            return None  # Don't draw if fully dead
         
         anim = self.animations.get(self.current_animation, self.animations['idle'])
+        drawn = None
         if anim['frames']:
             frame = anim['frames'][self.current_frame]
             screen_x = int(self.x) - camera_x
             screen_y = int(self.y) - camera_y
-            surface.blit(frame, (screen_x, screen_y))
+            drawn = surface.blit(frame, (screen_x, screen_y))
             
             # Draw HP bar above enemy
             if not self.is_dead and self.hp < self.max_hp:
@@ -912,6 +1285,8 @@ class Enemy:
                 hp_percent = self.hp / self.max_hp
                 hp_width = int(bar_width * hp_percent)
                 pygame.draw.rect(surface, (255, 0, 0), (bar_x, bar_y, hp_width, bar_height))
+                drawn = drawn.union((bar_x, bar_y, bar_width, bar_height))
+        return drawn
 
 # List of active enemies
 enemies = []
@@ -922,12 +1297,10 @@ enemies.append(Enemy(600, 1150, 'Rat1', 'South'))
 enemies.append(Enemy(400, 1100, 'Rat1', 'East'))
 
 
-# Load object definitions grouped by tileset from JSON
-with open(os.path.join('Tilesets', 'objects.json'), 'r') as f:
-    object_defs_by_tileset = json.load(f)
-
 # Cache for scaled tiles to avoid re-scaling every frame
 _SCALED_TILES_CACHE = {}
+# Cache for composed multi-tile objects, keyed by (object_name, id(tiles), scale)
+_OBJECT_SURFACE_CACHE = {}
 
 # Removed arrow projectile system (sword character doesn't use projectiles)
 # ARROW_SPEED = 7
@@ -937,10 +1310,20 @@ _SCALED_TILES_CACHE = {}
 projectiles = []  # each: {x,y,vx,vy,img,dist}
 _COL_TILE_SURF = None  # cached semi-transparent tile for collision overlay
 
+_HITBOX_SURFS = {}  # Semi-transparent hitbox overlay surfaces by size (COLLISION_MARGIN can change)
+
+def _get_hitbox_surface(size):
+    surf = _HITBOX_SURFS.get(size)
+    if surf is None:
+        surf = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        surf.fill((0, 255, 0, 100))  # semi-transparent green
+        _HITBOX_SURFS[size] = surf
+    return surf
+
 def _get_collision_tile_surface():
     global _COL_TILE_SURF
     if _COL_TILE_SURF is None:
-        surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA).convert_alpha()
         surf.fill((255, 0, 0, 90))  # semi-transparent red
         _COL_TILE_SURF = surf
     return _COL_TILE_SURF
@@ -953,7 +1336,7 @@ def _get_scaled_tiles(tiles, scale):
     if cached is not None:
         return cached
     scaled = [
-        pygame.transform.scale(t, (TILE_SIZE * scale, TILE_SIZE * scale))
+        pygame.transform.scale(t, (TILE_SIZE * scale, TILE_SIZE * scale)).convert_alpha()
         for t in tiles
     ]
     _SCALED_TILES_CACHE[key] = scaled
@@ -968,40 +1351,73 @@ def draw_object(surface, object_name, x, y, tiles, object_defs, scale=1):
     if not obj:
         return
     scale = max(1, int(scale))
-    chosen_tiles = _get_scaled_tiles(tiles, scale)
-    step = TILE_SIZE * scale
-    for row_idx, row in enumerate(obj):
-        for col_idx, tile_idx in enumerate(row):
-            if 0 <= tile_idx < len(chosen_tiles):
-                surface.blit(chosen_tiles[tile_idx], (x + col_idx * step, y + row_idx * step))
+    key = (object_name, id(tiles), scale)
+    composed = _OBJECT_SURFACE_CACHE.get(key)
+    if composed is None:
+        # Compose the object's tiles once into a single surface
+        chosen_tiles = _get_scaled_tiles(tiles, scale)
+        step = TILE_SIZE * scale
+        width_tiles = max((len(row) for row in obj), default=0)
+        size = (max(1, width_tiles * step), max(1, len(obj) * step))
+        composed = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        for row_idx, row in enumerate(obj):
+            for col_idx, tile_idx in enumerate(row):
+                if 0 <= tile_idx < len(chosen_tiles):
+                    composed.blit(chosen_tiles[tile_idx], (col_idx * step, row_idx * step))
+        _OBJECT_SURFACE_CACHE[key] = composed
+    surface.blit(composed, (x, y))
+
+# Held-key constants read every frame (bound once to skip the pygame attribute lookups)
+_K_a, _K_d, _K_w, _K_s = pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s
+_K_SPACE, _K_r, _K_F5 = pygame.K_SPACE, pygame.K_r, pygame.K_F5
+
+# Scene-switch hotkeys: key -> (scene name, move the player to the debug spawn point,
+# debug hotkey). F-keys log with the [DEBUG] prefix; F3 switches without a message.
+_DEBUG_SPAWN = (265, 425)
+_SCENE_KEYS = {
+    pygame.K_F1: ('overworld', True, True),
+    pygame.K_F2: ('cave', True, True),
+    pygame.K_F3: ('house', False, True),
+    pygame.K_F4: ('cave_1', True, True),
+    pygame.K_F5: ('cave_2', True, True),
+    pygame.K_1: ('overworld', False, False),
+    pygame.K_2: ('cave', False, False),
+    pygame.K_3: ('house', False, False),
+    pygame.K_4: ('cave_1', False, False),
+    pygame.K_5: ('cave_2', False, False),
+}
 
-def get_object_rect(object_name, x, y, object_defs, scale=1):
-    """Compute the object's bounding rect based on its definition and scale."""
-    obj = object_defs.get(object_name)
-    if not obj:
-        return pygame.Rect(x, y, 0, 0)
-    scale = max(1, int(scale))
-    height_tiles = len(obj)
-    width_tiles = max((len(row) for row in obj), default=0)
-    w = width_tiles * TILE_SIZE * scale
-    h = height_tiles * TILE_SIZE * scale
-    return pygame.Rect(x, y, w, h)
+# Dirty-rect presentation: while the view (scene, camera, door states, overlays)
+# is unchanged, only regions drawn last frame or this frame are pushed to the display
+_prev_dirty_rects = []
+_prev_view_state = None
+_prev_full_overlay = True
+# Set when the OS asks for a repaint (window exposed, restored or shown); the
+# display contents can't be trusted then, so the next present is a full update
+_window_invalidated = False
+_WINDOW_REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+                         pygame.WINDOWRESTORED, pygame.WINDOWSHOWN)
 
 run = True
 while run:
+    # One monotonic timestamp (ms) per frame, shared by all animation timing
+    current_time = _now_ms()
     # Clear the screen
     screen.fill((24, 24, 24))
     # Calculate map pixel size
-    map_width = len(current_scene.tilemap[0]) * TILE_SIZE if current_scene.tilemap else SCREEN_WIDTH
-    map_height = len(current_scene.tilemap) * TILE_SIZE if current_scene.tilemap else SCREEN_HEIGHT
+    map_width = current_scene.pixel_width
+    map_height = current_scene.pixel_height
     # Update camera position to follow player
     camera_x, camera_y = clamp_camera_to_map(player_x, player_y, map_width, map_height)
 
     # Draw the current scene (tilemap + objects) with camera
-    current_scene.draw(screen, object_defs_by_tileset, camera_x, camera_y)
+    current_scene.draw(screen, camera_x, camera_y)
+    # Everything that redraws the whole view when it changes
+    view_state = (current_scene, current_scene.visibility_version, camera_x, camera_y, show_collision_overlay)
+    frame_dirty_rects = []  # Screen regions drawn this frame on top of the static view
 
     # Optional: draw collision overlay on top of map layers (under player)
-    if show_collision_overlay and hasattr(current_scene, '_collision_grid') and current_scene._collision_grid:
+    if show_collision_overlay and current_scene._collision_grid:
         grid = current_scene._collision_grid
         grid_h = len(grid)
         grid_w = len(grid[0]) if grid_h else 0
@@ -1011,19 +1427,22 @@ while run:
             start_row = max(0, camera_y // TILE_SIZE)
             end_row = min(grid_h, (camera_y + SCREEN_HEIGHT) // TILE_SIZE + 1)
             cell_surf = _get_collision_tile_surface()
+            # bytearray.find jumps between solid cells in C; all cells go out in one blits call
+            overlay_blits = []
             for ry in range(start_row, end_row):
                 row = grid[ry]
                 y = ry * TILE_SIZE - camera_y
-                for rx in range(start_col, end_col):
-                    if row[rx]:
-                        x = rx * TILE_SIZE - camera_x
-                        screen.blit(cell_surf, (x, y))
+                rx = row.find(1, start_col, end_col)
+                while rx != -1:
+                    overlay_blits.append((cell_surf, (rx * TILE_SIZE - camera_x, y)))
+                    rx = row.find(1, rx + 1, end_col)
+            screen.blits(overlay_blits, doreturn=0)
 
-    # Handle movement and animation
+    # Handle movement and animation (key state is read once and reused for R/F5 below)
     key = pygame.key.get_pressed()
     current_animation = 'static'  # Default to static
     is_moving = False  # Track if player is actually moving
-    is_running = key[pygame.K_SPACE]  # Check if spacebar is held for running
+    is_running = key[_K_SPACE]  # Check if spacebar is held for running
 
     # Store the old position in case we need to revert due to collision
     old_player_x = player_x
@@ -1043,55 +1462,50 @@ while run:
 
     # Update floating point position (allow movement during walk/run attacks)
     if not is_attacking or can_move_during_attack:
-        if key[pygame.K_a]:
+        moving_west, moving_east, moving_north, moving_south = key[_K_a], key[_K_d], key[_K_w], key[_K_s]
+        if moving_west:
             player_x -= current_speed
-            moving_west = True
             last_horizontal_direction = 'west'
-            is_moving = True
-        if key[pygame.K_d]:
+        if moving_east:
             player_x += current_speed
-            moving_east = True
             last_horizontal_direction = 'east'
-            is_moving = True
-        if key[pygame.K_w]:
+        if moving_north:
             player_y -= current_speed
-            moving_north = True
-            is_moving = True
-        if key[pygame.K_s]:
+        if moving_south:
             player_y += current_speed
-            moving_south = True
-            is_moving = True
+        is_moving = moving_west or moving_east or moving_north or moving_south
 
     # --- Tile collision resolution (axis-aligned) ---
-    dx = player_x - old_player_x
-    dy = player_y - old_player_y
-    # Base rect at old position
-    base_rect = player.copy()
-    base_rect.topleft = (round(old_player_x), round(old_player_y))
-    hitbox = base_rect.inflate(-COLLISION_MARGIN, -COLLISION_MARGIN)
-    # Horizontal
-    if abs(dx) > 0:
-        test_rect = hitbox.copy()
-        test_rect.x += int(round(dx))
-        if current_scene and hasattr(current_scene, 'collides_rect_with_tiles') and current_scene.collides_rect_with_tiles(test_rect):
-            player_x = old_player_x  # block horizontal move
-            dx = 0
-        else:
-            player_x = old_player_x + dx
-    # Vertical (use possibly-updated x)
-    if abs(dy) > 0:
-        test_rect = hitbox.copy()
-        test_rect.x = int(round(player_x))
-        test_rect.y += int(round(dy))
-        if current_scene and hasattr(current_scene, 'collides_rect_with_tiles') and current_scene.collides_rect_with_tiles(test_rect):
-            player_y = old_player_y  # block vertical move
-            dy = 0
-        else:
-            player_y = old_player_y + dy
+    # Standing still is the common case; nothing to resolve when the position is unchanged
+    moved = player_x != old_player_x or player_y != old_player_y
+    if moved:
+        dx = player_x - old_player_x
+        dy = player_y - old_player_y
+        # Base rect at old position
+        base_rect = player.copy()
+        base_rect.topleft = (round(old_player_x), round(old_player_y))
+        hitbox = base_rect.inflate(-COLLISION_MARGIN, -COLLISION_MARGIN)
+        # Horizontal
+        if abs(dx) > 0:
+            test_rect = hitbox.copy()
+            test_rect.x += int(round(dx))
+            if current_scene.collides_rect_with_tiles(test_rect):
+                player_x = old_player_x  # block horizontal move
+                dx = 0
+            else:
+                player_x = old_player_x + dx
+        # Vertical (use possibly-updated x)
+        if abs(dy) > 0:
+            test_rect = hitbox.copy()
+            test_rect.x = int(round(player_x))
+            test_rect.y += int(round(dy))
+            if current_scene.collides_rect_with_tiles(test_rect):
+                player_y = old_player_y  # block vertical move
+                dy = 0
+            else:
+                player_y = old_player_y + dy
 
     # Determine the animation based on movement direction and running state
-    animation_prefix = 'run_' if is_running else ''
-
     # During walk/run attacks, keep moving
     if is_attacking and current_attack and ('walk_attack' in current_attack or 'run_attack' in current_attack):
         # Allow movement during walk/run attacks
@@ -1111,49 +1525,35 @@ while run:
         # Standing attack - stop movement
         current_animation = current_attack
     elif moving_east:
-        current_animation = f'{animation_prefix}east'
+        current_animation = _ANIM_LOOKUP[(is_running, 'east')]
         last_facing_direction = 'east'
         last_horizontal_direction = 'east'
     elif moving_west:
-        current_animation = f'{animation_prefix}west'
+        current_animation = _ANIM_LOOKUP[(is_running, 'west')]
         last_facing_direction = 'west'
         last_horizontal_direction = 'west'
     elif moving_north:
         # Pure north movement - use north animation
-        current_animation = f'{animation_prefix}north'
+        current_animation = _ANIM_LOOKUP[(is_running, 'north')]
         last_facing_direction = 'north'
     elif moving_south:
         # Pure south movement - use south animation
-        current_animation = f'{animation_prefix}south'
+        current_animation = _ANIM_LOOKUP[(is_running, 'south')]
         last_facing_direction = 'south'
 
     # Update the rect position from floating point position
     player.x = round(player_x)
     player.y = round(player_y)
 
-    # Check collision with solid objects
-    obj_defs = object_defs_by_tileset.get(current_scene.tileset_name, {})
-    for obj in current_scene.objects:
-        # Skip non-solid objects or invisible objects
-        if not obj.get('solid', False):
-            continue
-        if not obj.get('visible', True):
-            continue
-
-        scale = max(1, int(obj.get('scale', 1)))
-        obj_rect = get_object_rect(obj['name'], obj['x'], obj['y'], obj_defs, scale)
-
-        # Create a smaller player hitbox for more forgiving collision (world coordinates)
-        player_hitbox = player.inflate(-COLLISION_MARGIN, -COLLISION_MARGIN)
-        # Check if player collides with this solid object (use world coordinates for both)
-        if player_hitbox.colliderect(obj_rect):
-            # Collision detected - revert to old position
-            player_x = old_player_x
-            player_y = old_player_y
-            player.x = round(player_x)
-            player.y = round(player_y)
-            is_moving = False  # Stop the walking animation
-            break  # Stop checking other objects once we hit one
+    # Check collision with solid objects, using a smaller player hitbox for more
+    # forgiving collision (world coordinates for both)
+    if moved and current_scene.collides_rect_with_solids(player.inflate(-COLLISION_MARGIN, -COLLISION_MARGIN)):
+        # Collision detected - revert to old position
+        player_x = old_player_x
+        player_y = old_player_y
+        player.x = round(player_x)
+        player.y = round(player_y)
+        is_moving = False  # Stop the walking animation
 
 
     # ==================== ENEMY UPDATES ====================
@@ -1161,7 +1561,7 @@ while run:
     
     # Update all enemies
     for enemy in enemies[:]:  # Copy list to allow removal
-        enemy.update(dt)
+        enemy.update(dt, current_time)
         enemy.rect.x = int(enemy.x)
         enemy.rect.y = int(enemy.y)
         
@@ -1200,19 +1600,18 @@ while run:
     projectiles.clear()  # Clear any stray projectiles
 
     # Handle animation
-    current_time = time.time() * 1000
     anim = animation_data[current_animation]
-    if current_time - anim['last_update'] > anim['durations'][anim['current_frame']]:
-        next_frame = anim['current_frame'] + 1
-        if anim.get('loop', True):
-            anim['current_frame'] = next_frame % len(anim['frames'])
+    if current_time - anim.last_update > anim.durations[anim.current_frame]:
+        next_frame = anim.current_frame + 1
+        if anim.loop:
+            anim.current_frame = next_frame % len(anim.frames)
         else:
-            if next_frame < len(anim['frames']):
-                anim['current_frame'] = next_frame
+            if next_frame < len(anim.frames):
+                anim.current_frame = next_frame
             else:
                 # Non-looping animation ended
                 ended_attack = current_attack if is_attacking else None
-                anim['current_frame'] = len(anim['frames']) - 1
+                anim.current_frame = len(anim.frames) - 1
                 # Sword character doesn't spawn projectiles (no ranged attacks)
                 # if ended_attack and ended_attack.startswith('shot'):
                 #     spawn_arrow(last_facing_direction, player)
@@ -1225,8 +1624,8 @@ while run:
                     # Reset to static; facing image will be used below
                     current_animation = 'static'
                     # Reset for next time we play this attack
-                    anim['current_frame'] = 0
-        anim['last_update'] = current_time
+                    anim.current_frame = 0
+        anim.last_update = current_time
 
     # Draw projectiles (disabled for sword character)
     # if projectiles:
@@ -1235,43 +1634,40 @@ while run:
 
     # Draw enemies
     for enemy in enemies:
-        enemy.draw(screen, camera_x, camera_y)
+        enemy_rect = enemy.draw(screen, camera_x, camera_y)
+        if enemy_rect:
+            frame_dirty_rects.append(enemy_rect)
     
     # Draw the current animation frame or facing image
+    player_draw_pos = (player.x - camera_x, player.y - camera_y)
     if is_attacking and current_attack:
         attack_anim = animation_data[current_attack]
-        frame = attack_anim['frames'][attack_anim['current_frame']]
-        screen.blit(frame, player.move(-camera_x, -camera_y))
+        frame = attack_anim.frames[attack_anim.current_frame]
+        frame_dirty_rects.append(screen.blit(frame, player_draw_pos))
     elif is_moving:
         # Show walking/running animation
-        current_frame_img = animation_data[current_animation]['frames'][anim['current_frame']]
-        screen.blit(current_frame_img, player.move(-camera_x, -camera_y))
+        current_frame_img = animation_data[current_animation].frames[anim.current_frame]
+        frame_dirty_rects.append(screen.blit(current_frame_img, player_draw_pos))
 
     else:
         # Show static facing image based on last direction
-        screen.blit(facing_images[last_facing_direction], player.move(-camera_x, -camera_y))
-
-    # Draw player hitbox overlay if enabled (after player is drawn)
-    if show_player_hitbox_overlay:
-        hitbox = player.copy().inflate(-COLLISION_MARGIN, -COLLISION_MARGIN)
-        hitbox_rect = pygame.Rect(hitbox.x - camera_x, hitbox.y - camera_y, hitbox.width, hitbox.height)
-        hitbox_surface = pygame.Surface((hitbox.width, hitbox.height), pygame.SRCALPHA)
-        hitbox_surface.fill((0, 255, 0, 100))  # semi-transparent green
-        screen.blit(hitbox_surface, hitbox_rect)
+        frame_dirty_rects.append(screen.blit(facing_images[last_facing_direction], player_draw_pos))
 
     # Draw player hitbox overlay if enabled (after player is drawn)
     if show_player_hitbox_overlay:
-        hitbox = player.copy().inflate(-COLLISION_MARGIN, -COLLISION_MARGIN)
-        hitbox_rect = pygame.Rect(hitbox.x - camera_x, hitbox.y - camera_y, hitbox.width, hitbox.height)
-        hitbox_surface = pygame.Surface((hitbox.width, hitbox.height), pygame.SRCALPHA)
-        hitbox_surface.fill((0, 255, 0, 100))  # semi-transparent green
-        screen.blit(hitbox_surface, hitbox_rect)
+        hitbox = player.inflate(-COLLISION_MARGIN, -COLLISION_MARGIN)
+        screen.blit(_get_hitbox_surface(hitbox.size), (hitbox.x - camera_x, hitbox.y - camera_y))
 
     # Draw health bar (top-left corner)
-    draw_health_bar(screen, HEALTH_BAR_X, HEALTH_BAR_Y, player_hp, player_max_hp, HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT, HEALTH_BAR_BORDER)
+    frame_dirty_rects.append(draw_health_bar(screen, HEALTH_BAR_X, HEALTH_BAR_Y, player_hp, player_max_hp, HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT, HEALTH_BAR_BORDER))
 
     # Draw and handle items for the current scene
-    for item in getattr(current_scene, 'items', []):
+    # Bouncing arrow offset is the same for every item this frame
+    arrow_offset = _ARROW_BOB_LUT[int(current_time * _ARROW_PHASE_SCALE) % ARROW_LUT_SIZE]
+    drawn_items = []
+    drawn_item_rects = []
+    item_blits = []
+    for item in current_scene.items:
         if item.get('collected'):
             continue
         item_type = item.get('type')
@@ -1280,32 +1676,36 @@ while run:
             continue
         # Position from scene item definition (pixel coordinates)
         item_rect = img.get_rect(topleft=(item.get('x', 0) - camera_x, item.get('y', 0) - camera_y))
-        screen.blit(img, item_rect)
-
+        item_blits.append((img, item_rect))
+        drawn_items.append(item)
+        drawn_item_rects.append(item_rect)
+    # All item images in one blits call, then the arrows on top in a second pass
+    if item_blits:
+        frame_dirty_rects.extend(screen.blits(item_blits))
+    for item_rect in drawn_item_rects:
         # Bouncing arrow indicator
-        arrow_offset = math.sin(time.time() * ARROW_SPEED * 1000) * ARROW_AMPLITUDE
         arrow_x = item_rect.centerx
         arrow_y = item_rect.top - arrow_base_y + arrow_offset
-        arrow_points = [
-            (arrow_x, arrow_y + 15),
-            (arrow_x - 10, arrow_y),
-            (arrow_x + 10, arrow_y)
-        ]
-        pygame.draw.polygon(screen, (255, 255, 0), arrow_points)
-
-        # Pickup detection
-        if player.move(-camera_x, -camera_y).colliderect(item_rect):
-            item['collected'] = True
+        _ARROW_PTS[0][0] = arrow_x
+        _ARROW_PTS[0][1] = arrow_y + 15
+        _ARROW_PTS[1][0] = arrow_x - 10
+        _ARROW_PTS[1][1] = arrow_y
+        _ARROW_PTS[2][0] = arrow_x + 10
+        _ARROW_PTS[2][1] = arrow_y
+        frame_dirty_rects.append(pygame.draw.polygon(screen, (255, 255, 0), _ARROW_PTS))
+
+    # Pickup detection (all overlapping items in one C call)
+    if drawn_item_rects:
+        for i in player.move(-camera_x, -camera_y).collidelistall(drawn_item_rects):
+            drawn_items[i]['collected'] = True
             # For now add a generic item token (1). Can extend to item ids later.
             inventory.add_item(1)
 
     # Check if R key is currently pressed (not just when it's first pressed)
-    keys = pygame.key.get_pressed()
-    inventory.visible = keys[pygame.K_r]
+    inventory.visible = key[_K_r]
 
     # Debug overlay (press F5 to toggle)
-    if keys[pygame.K_F5]:
-        font = pygame.font.Font(None, 24)
+    if key[_K_F5]:
         debug_texts = [
             f"Player: ({int(player_x)}, {int(player_y)}) | Tile: ({int(player_x//TILE_SIZE)}, {int(player_y//TILE_SIZE)})",
             f"Camera: ({camera_x}, {camera_y})",
@@ -1313,13 +1713,17 @@ while run:
             f"Collision margin: {COLLISION_MARGIN} px"
         ]
         for i, text in enumerate(debug_texts):
-            surf = font.render(text, True, (255, 255, 0))
-            screen.blit(surf, (10, SCREEN_HEIGHT - 100 + i * 25))
+            cached = _debug_line_surfs.get(i)
+            if cached is None or cached[0] != text:
+                cached = _debug_line_surfs[i] = (text, DEBUG_FONT.render(text, True, (255, 255, 0)))
+            screen.blit(cached[1], (10, SCREEN_HEIGHT - 100 + i * 25))
 
     # Handle other events
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             run = False
+        elif event.type in _WINDOW_REDRAW_EVENTS:
+            _window_invalidated = True
         elif event.type == pygame.KEYDOWN:
             # --- DEBUG HOTKEYS ---
             if event.key == pygame.K_F6:
@@ -1359,27 +1763,30 @@ while run:
                     if key_name in animation_data:
                         current_attack = key_name
                         is_attacking = True
-                        animation_data[current_attack]['current_frame'] = 0
-                        animation_data[current_attack]['last_update'] = time.time() * 1000
+                        animation_data[current_attack].current_frame = 0
+                        animation_data[current_attack].last_update = current_time
                 # K key removed - sword character has no ranged attacks
                 # elif event.key == pygame.K_k and ('shot1_east' in animation_data or 'shot1_west' in animation_data):
                 #     # Shot 1 (disabled for sword character)
                 #     pass
 
-            if event.key == pygame.K_F1:
-                current_scene = scenes['overworld']
-                player.center = (265, 425)
-                player_x = float(player.x)
-                player_y = float(player.y)
-                print("[DEBUG] Jumped to overworld scene.")
-            elif event.key == pygame.K_F2:
-                current_scene = scenes['cave']
-                player.center = (265, 425)
-                player_x = float(player.x)
-                player_y = float(player.y)
-                print("[DEBUG] Jumped to cave scene.")
-            elif event.key == pygame.K_F3:
-                current_scene = scenes['house']
+            # Scene switching (F1, F2, F4, F5 jump to the debug spawn point; F3 and number keys keep the position)
+            scene_switch = _SCENE_KEYS.get(event.key)
+            if scene_switch:
+                target, respawn, debug_key = scene_switch
+                if target in scenes:
+                    current_scene = scenes[target]
+                    if respawn:
+                        player.center = _DEBUG_SPAWN
+                        player_x = float(player.x)
+                        player_y = float(player.y)
+                        print(f"[DEBUG] Jumped to {target} scene.")
+                    elif not debug_key:
+                        print(f"Switched to {target}")
+                elif debug_key:
+                    print(f"[DEBUG] Scene '{target}' not found.")
+                else:
+                    print(f"Scene '{target}' not found")
 
             # --- HEALTH TEST KEYS ---
             if event.key == pygame.K_h:
@@ -1390,112 +1797,63 @@ while run:
                 # Heal (for testing)
                 player_hp = min(player_max_hp, player_hp + 15)
                 print(f"[DEBUG] Player healed! HP: {player_hp}/{player_max_hp}")
-            elif event.key == pygame.K_F5:
-                if 'cave_2' in scenes:
-                    current_scene = scenes['cave_2']
-                    player.center = (265, 425)
-                    player_x = float(player.x)
-                    player_y = float(player.y)
-                    print("[DEBUG] Jumped to cave_2 scene.")
-                else:
-                    print("[DEBUG] Scene 'cave_2' not found.")
-            elif event.key == pygame.K_F4:
-                if 'cave_1' in scenes:
-                    current_scene = scenes['cave_1']
-                    player.center = (265, 425)
-                    player_x = float(player.x)
-                    player_y = float(player.y)
-                    print("[DEBUG] Jumped to cave_1 scene.")
-                else:
-                    print("[DEBUG] Scene 'cave_1' not found.")
-            # Scene switching with number keys
-            if event.key == pygame.K_1:
-                current_scene = scenes['overworld']
-                print("Switched to overworld")
-            elif event.key == pygame.K_2:
-                current_scene = scenes['cave']
-                print("Switched to cave")
-            elif event.key == pygame.K_3:
-                current_scene = scenes['house']
-                print("Switched to house")
-            elif event.key == pygame.K_4:
-                if 'cave_1' in scenes:
-                    current_scene = scenes['cave_1']
-                    print("Switched to cave_1")
-                else:
-                    print("Scene 'cave_1' not found")
-            elif event.key == pygame.K_5:
-                if 'cave_2' in scenes:
-                    current_scene = scenes['cave_2']
-                    print("Switched to cave_2")
-                else:
-                    print("Scene 'cave_2' not found")
             elif event.key == pygame.K_e:
                 # Toggle nearest interactive object's visibility if within radius
                 px, py = player.centerx, player.centery
                 # find objects that are interactive (toggleable)
-                for obj in current_scene.objects:
+                for obj in current_scene.interactives:
                     # If toggleKey specified, require it to be 'e' (default accepts any if missing)
-                    toggle_key = obj.get('toggleKey')
+                    toggle_key = obj.toggleKey
                     if toggle_key is not None and toggle_key != 'e':
                         continue
-                    if not obj.get('interactive', False):
-                        continue
-                    scale = max(1, int(obj.get('scale', 1)))
-                    rect = get_object_rect(
-                        obj['name'], obj['x'], obj['y'],
-                        object_defs_by_tileset.get(current_scene.tileset_name, {}),
-                        scale
-                    )
+                    rect = obj.rect
                     cx, cy = rect.centerx, rect.centery
                     dx = px - cx
                     dy = py - cy
-                    dist = math.hypot(dx, dy)
-                    radius = obj.get('radius', 60)
-                    if dist <= radius:
-                        obj['visible'] = not obj.get('visible', True)
-                        state = 'shown' if obj['visible'] else 'hidden'
-                        print(f"Toggled {obj['name']} -> {state}")
+                    if dx * dx + dy * dy <= obj.radius_sq:
+                        obj.visible = not obj.visible
+                        current_scene.refresh_visibility()
+                        state = 'shown' if obj.visible else 'hidden'
+                        print(f"Toggled {obj.name} -> {state}")
                         break
 
     # After handling input, check for portal transitions on open doors
-    for obj in getattr(current_scene, 'objects', []):
-        portal = obj.get('portal')
-        if not portal:
-            continue
-        # Require door to be open (invisible) to enter
-        if obj.get('visible', True):
-            continue
-        scale = max(1, int(obj.get('scale', 1)))
-        rect = get_object_rect(
-            obj['name'], obj['x'], obj['y'],
-            object_defs_by_tileset.get(current_scene.tileset_name, {}),
-            scale
-        )
-        if player.colliderect(rect):
-            target = portal.get('targetScene')
-            if target and target in scenes:
-                current_scene = scenes[target]
-                # Move player to spawn position
-                sx = int(portal.get('spawnX', player.centerx))
-                sy = int(portal.get('spawnY', player.centery))
-                player.center = (sx, sy)
-                player_x = float(player.x)
-                player_y = float(player.y)
-                print(f"Entered scene '{target}' at ({sx}, {sy})")
-            break
+    # (only open, i.e. invisible, doors are in the scene's portal rect list).
+    # Runs every frame, moved or not: a door opened (E) while the player stands
+    # in it must still fire, so keep this outside the 'moved' collision skip.
+    portal_obj = current_scene.portal_at_rect(player)
+    if portal_obj:
+        portal = portal_obj.portal
+        target = portal.get('targetScene')
+        if target and target in scenes:
+            current_scene = scenes[target]
+            # Move player to spawn position
+            sx = int(portal.get('spawnX', player.centerx))
+            sy = int(portal.get('spawnY', player.centery))
+            player.center = (sx, sy)
+            player_x = float(player.x)
+            player_y = float(player.y)
+            print(f"Entered scene '{target}' at ({sx}, {sy})")
 
     # Only draw inventory while R is held down
     if inventory.visible:
         # Add a semi-transparent background when inventory is open
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)  # 128 for 50% transparency
-        screen.blit(overlay, (0, 0))
+        screen.blit(_INV_OVERLAY, (0, 0))
         # Draw inventory with item images
-        inventory.draw(screen, sword_image)
-
-    pygame.display.update()
+        inventory.draw(screen, 'sword')
+
+    # Full-screen overlays, any change to the view, or a window repaint request need a
+    # full update; otherwise push only what moved (last frame's regions are included
+    # so vacated pixels refresh)
+    full_overlay = inventory.visible or key[_K_F5] or show_player_hitbox_overlay
+    if full_overlay or _prev_full_overlay or _window_invalidated or view_state != _prev_view_state:
+        pygame.display.update()
+        _window_invalidated = False
+    else:
+        pygame.display.update(_prev_dirty_rects + frame_dirty_rects)
+    _prev_dirty_rects = frame_dirty_rects
+    _prev_view_state = view_state
+    _prev_full_overlay = full_overlay
     clock.tick(FRAME_RATE)
 
 pygame.quit()
\ No newline at end of file
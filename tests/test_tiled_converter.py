@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiled_converter import convert_tiled_to_scene
+
+
+class ConvertJsonObjectPropertiesTest(unittest.TestCase):
+    """Tiled JSON/TMJ maps store object properties as a list of {name, type, value}."""
+
+    def _map(self, objects):
+        return {
+            'width': 2,
+            'height': 1,
+            'tilesets': [{'name': 'Overworld', 'firstgid': 1}],
+            'layers': [
+                {'type': 'tilelayer', 'name': 'ground', 'data': [1, 2]},
+                {'type': 'objectgroup', 'name': 'objects', 'objects': objects},
+            ],
+        }
+
+    def test_list_form_object_properties(self):
+        tiled = self._map([
+            {'name': 'door', 'x': 32, 'y': 48, 'properties': [
+                {'name': 'solid', 'type': 'bool', 'value': True},
+                {'name': 'visible', 'type': 'bool', 'value': False},
+                {'name': 'scale', 'type': 'int', 'value': 2},
+                {'name': 'toggleKey', 'type': 'string', 'value': 'e'},
+                {'name': 'portal', 'type': 'string', 'value': '{"targetScene": "cave"}'},
+            ]},
+            {'name': 'chest', 'x': 5, 'y': 6, 'properties': [
+                {'name': 'item_type', 'type': 'string', 'value': 'sword'},
+            ]},
+        ])
+        scene = convert_tiled_to_scene(tiled, 'test')
+        self.assertEqual(scene['objects'], [{
+            'name': 'door', 'x': 32, 'y': 48,
+            'scale': 2, 'solid': True, 'visible': False, 'toggleKey': 'e',
+            'portal': {'targetScene': 'cave'},
+        }])
+        self.assertEqual(scene['items'], [{'type': 'sword', 'x': 5, 'y': 6}])
+
+    def test_dict_form_and_missing_object_properties(self):
+        tiled = self._map([
+            {'name': 'rock', 'x': 1, 'y': 2, 'properties': {'solid': True}},
+            {'name': 'bush', 'x': 3, 'y': 4},
+        ])
+        scene = convert_tiled_to_scene(tiled, 'test')
+        self.assertEqual(scene['objects'], [
+            {'name': 'rock', 'x': 1, 'y': 2, 'solid': True},
+            {'name': 'bush', 'x': 3, 'y': 4},
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
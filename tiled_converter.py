@@ -13,10 +13,35 @@ Example:
 import json
 import sys
 import os
-import xml.etree.ElementTree as ET
-import base64
+try:
+    from lxml import etree as ET  # Optional: libxml2 parser, same findall/get/text API
+except ImportError:
+    import xml.etree.ElementTree as ET
+try:
+    from pybase64 import b64decode  # Optional: SIMD base64 decoder
+except ImportError:
+    from base64 import b64decode
 import zlib
-import struct
+from array import array
+try:
+    import orjson  # Optional: much faster reading/writing of a large scenes.json
+except ImportError:
+    orjson = None
+try:
+    import deflate  # Optional: libdeflate bindings, faster one-shot zlib decompression
+except ImportError:
+    deflate = None
+
+
+# Object properties copied as-is into the scene's object dicts ('portal' is decoded separately)
+_PASSTHROUGH_KEYS = ('scale', 'solid', 'visible', 'interactive', 'toggleKey')
+
+
+def _zlib_decompress(data, size):
+    """Inflate zlib-compressed layer data whose decompressed size is known."""
+    if deflate is not None:
+        return deflate.zlib_decompress(data, size)
+    return zlib.decompress(data)
 
 
 def parse_tmx(tmx_file):
@@ -58,14 +83,21 @@ def parse_tmx(tmx_file):
         
         if encoding == 'csv':
             csv_data = data_elem.text.strip()
-            layer_data['data'] = [int(x) for x in csv_data.split(',')]
+            # int() ignores the surrounding whitespace/newlines, so map it straight over the split
+            layer_data['data'] = list(map(int, csv_data.split(',')))
         elif encoding == 'base64':
             compression = data_elem.get('compression')
-            decoded = base64.b64decode(data_elem.text.strip())
+            decoded = b64decode(data_elem.text.strip())
             if compression == 'zlib':
-                decoded = zlib.decompress(decoded)
-            # Unpack as unsigned integers (4 bytes each)
-            layer_data['data'] = list(struct.unpack('<%dI' % (len(decoded) // 4), decoded))
+                # 4 bytes per tile, so the inflated size is known up front
+                decoded = _zlib_decompress(decoded, 4 * layer_data['width'] * layer_data['height'])
+            # Little-endian unsigned integers (4 bytes each), read in one C call and
+            # kept unboxed; convert_tiled_to_scene turns them into list rows
+            gids = array('I')
+            gids.frombytes(decoded[:len(decoded) - len(decoded) % 4])
+            if sys.byteorder == 'big':
+                gids.byteswap()
+            layer_data['data'] = gids
         
         map_data['layers'].append(layer_data)
     
@@ -78,33 +110,36 @@ def parse_tmx(tmx_file):
         }
         
         for obj in objectgroup.findall('object'):
+            get = obj.get  # Bound once; read for every attribute below
+            obj_props = {}
             obj_data = {
-                'id': int(obj.get('id')),
-                'name': obj.get('name', ''),
-                'x': float(obj.get('x')),
-                'y': float(obj.get('y')),
-                'width': float(obj.get('width', 0)),
-                'height': float(obj.get('height', 0)),
-                'properties': {}
+                'id': int(get('id')),
+                'name': get('name', ''),
+                'x': float(get('x')),
+                'y': float(get('y')),
+                'width': float(get('width', 0)),
+                'height': float(get('height', 0)),
+                'properties': obj_props
             }
             
             # Parse custom properties
             properties = obj.find('properties')
             if properties is not None:
                 for prop in properties.findall('property'):
-                    prop_name = prop.get('name')
-                    prop_type = prop.get('type', 'string')
-                    prop_value = prop.get('value')
+                    prop_get = prop.get
+                    prop_name = prop_get('name')
+                    prop_type = prop_get('type', 'string')
+                    prop_value = prop_get('value')
                     
                     # Convert types
                     if prop_type == 'bool':
-                        obj_data['properties'][prop_name] = prop_value.lower() == 'true'
+                        obj_props[prop_name] = prop_value.lower() == 'true'
                     elif prop_type == 'int':
-                        obj_data['properties'][prop_name] = int(prop_value)
+                        obj_props[prop_name] = int(prop_value)
                     elif prop_type == 'float':
-                        obj_data['properties'][prop_name] = float(prop_value)
+                        obj_props[prop_name] = float(prop_value)
                     else:
-                        obj_data['properties'][prop_name] = prop_value
+                        obj_props[prop_name] = prop_value
             
             og_data['objects'].append(obj_data)
         
@@ -115,10 +150,46 @@ def parse_tmx(tmx_file):
 
 def parse_json(json_file):
     """Parse JSON format from Tiled."""
-    with open(json_file, 'r') as f:
+    with open(json_file, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
+def _properties_dict(props):
+    """Flatten Tiled properties to a {name: value} dict.
+
+    Tiled JSON/TMJ stores properties as a list of {name, type, value} dicts;
+    parse_tmx (and older exports) already give a dict.
+    """
+    if isinstance(props, dict):
+        return props
+    props_dict = {}
+    if isinstance(props, list):
+        for p in props:
+            if isinstance(p, dict) and 'name' in p:
+                props_dict[p['name']] = p.get('value')
+    return props_dict
+
+
+def _assemble_chunk_layer(layer, min_x, min_y, width, height):
+    """Place an infinite-map layer's chunks into a width x height grid whose origin is (min_x, min_y)."""
+    # Row-list multiplication (one C-level fill per row); rows must stay distinct lists
+    layer_map = [[0] * width for _ in range(height)]
+    for c in layer.get('chunks', []) or []:
+        cw, ch = c['width'], c['height']
+        cx, cy = c['x'] - min_x, c['y'] - min_y
+        data = list(c.get('data', [])[:cw * ch])
+        if len(data) < cw * ch:
+            data.extend([0] * (cw * ch - len(data)))
+        # Copy each chunk row with one slice assignment, clipped to the map
+        c0, c1 = max(0, -cx), min(cw, width - cx)
+        if c0 >= c1:
+            continue
+        for r in range(max(0, -cy), min(ch, height - cy)):
+            start = r * cw
+            layer_map[cy + r][cx + c0:cx + c1] = data[start + c0:start + c1]
+    return layer_map
+
+
 def convert_tiled_to_scene(tiled_data, scene_name, tileset_name=None):
     """Convert Tiled map data to game's scene format."""
     
@@ -182,34 +253,18 @@ def convert_tiled_to_scene(tiled_data, scene_name, tileset_name=None):
             print(f"[DEBUG] Assembled (multi-layer) tilemap size: {width}x{height} (min_x={min_x}, min_y={min_y})")
             # Build per-layer maps aligned to the same extents
             for layer in tile_layers:
-                layer_map = [[0 for _ in range(width)] for _ in range(height)]
-                for c in layer.get('chunks', []) or []:
-                    cw, ch = c['width'], c['height']
-                    cx, cy = c['x'] - min_x, c['y'] - min_y
-                    data = c.get('data', [])
-                    for r in range(ch):
-                        for col in range(cw):
-                            idx = r * cw + col
-                            gid = data[idx] if idx < len(data) else 0
-                            rr = cy + r
-                            cc = cx + col
-                            if 0 <= rr < height and 0 <= cc < width:
-                                layer_map[rr][cc] = int(gid)
-                composed_layers.append(layer_map)
+                composed_layers.append(_assemble_chunk_layer(layer, min_x, min_y, width, height))
         else:
             # Finite map: use the overall map width/height
             width = tiled_data.get('width', tile_layers[0].get('width'))
             height = tiled_data.get('height', tile_layers[0].get('height'))
+            size = width * height
             for layer in tile_layers:
-                data = layer.get('data', [])
-                layer_map = []
-                for row in range(height):
-                    row_data = []
-                    for col in range(width):
-                        idx = row * width + col
-                        gid = data[idx] if idx < len(data) else 0
-                        row_data.append(int(gid))
-                    layer_map.append(row_data)
+                data = list(layer.get('data', [])[:size])
+                # Pad short layers once, then cut whole rows out as slices
+                if len(data) < size:
+                    data.extend([0] * (size - len(data)))
+                layer_map = [data[r * width:(r + 1) * width] for r in range(height)]
                 composed_layers.append(layer_map)
 
         # Save per-layer maps
@@ -218,35 +273,25 @@ def convert_tiled_to_scene(tiled_data, scene_name, tileset_name=None):
         layer_names = [layer.get('name', '') for layer in tile_layers]
         layer_props = []
         for layer in tile_layers:
-            props_dict = {}
-            props = layer.get('properties') or []
-            # Tiled JSON stores properties as list of {name,type,value}
-            if isinstance(props, list):
-                for p in props:
-                    if isinstance(p, dict) and 'name' in p:
-                        props_dict[p['name']] = p.get('value')
-            elif isinstance(props, dict):
-                props_dict = props
-            layer_props.append(props_dict)
+            layer_props.append(_properties_dict(layer.get('properties')))
         scene['layer_names'] = layer_names
         scene['layer_props'] = layer_props
         # Also create a flattened composite for compatibility and sizing
-        composite = [[0 for _ in range(width)] for _ in range(height)]
-        for layer_map in composed_layers:
-            for r in range(height):
-                row_l = layer_map[r]
-                row_c = composite[r]
-                for c in range(width):
-                    gid = row_l[c]
-                    if gid:
-                        row_c[c] = gid
+        # Fold all layers one row at a time (non-zero GIDs overwrite), so only
+        # a single partial row is alive instead of a whole grid per layer
+        composite = []
+        for layer_rows in zip(*composed_layers):
+            row_c = [0] * width
+            for row_l in layer_rows:
+                row_c = [gid or below for gid, below in zip(row_l, row_c)]
+            composite.append(row_c)
         scene['tilemap'] = composite
     
     # Process object layers
     for layer in tiled_data.get('layers', []):
         if layer.get('type') == 'objectgroup':
             for obj in layer.get('objects', []):
-                props = obj.get('properties', {})
+                props = _properties_dict(obj.get('properties'))
                 
                 # Check if this is an item (has 'item_type' property)
                 if 'item_type' in props:
@@ -265,16 +310,10 @@ def convert_tiled_to_scene(tiled_data, scene_name, tileset_name=None):
                     }
                     
                     # Add optional properties
-                    if 'scale' in props:
-                        game_obj['scale'] = props['scale']
-                    if 'solid' in props:
-                        game_obj['solid'] = props['solid']
-                    if 'visible' in props:
-                        game_obj['visible'] = props['visible']
-                    if 'interactive' in props:
-                        game_obj['interactive'] = props['interactive']
-                    if 'toggleKey' in props:
-                        game_obj['toggleKey'] = props['toggleKey']
+                    for key in _PASSTHROUGH_KEYS:
+                        value = props.get(key)
+                        if value is not None:
+                            game_obj[key] = value
                     if 'portal' in props:
                         # Portal should be a JSON string
                         try:
@@ -287,24 +326,58 @@ def convert_tiled_to_scene(tiled_data, scene_name, tileset_name=None):
     return scene
 
 
+class ScenesWriter:
+    """Batch updates to scenes.json: load it once on enter, write it once on exit.
+
+    Usage:
+        with ScenesWriter('Tilesets/scenes.json') as writer:
+            writer.update('cave', cave_scene)
+            writer.update('house', house_scene)
+    """
+
+    def __init__(self, scenes_file='Tilesets/scenes.json'):
+        self.scenes_file = scenes_file
+        self.scenes = {}
+        self.updated = []
+
+    def __enter__(self):
+        # Load existing scenes
+        if os.path.exists(self.scenes_file):
+            if orjson is not None:
+                with open(self.scenes_file, 'rb') as f:
+                    self.scenes = orjson.loads(f.read())
+            else:
+                with open(self.scenes_file, 'r', encoding='utf-8') as f:
+                    self.scenes = json.load(f)
+        return self
+
+    def update(self, scene_name, scene_data):
+        """Update or add a scene (written out when the block exits)."""
+        self.scenes[scene_name] = scene_data
+        self.updated.append(scene_name)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            return False  # Leave scenes.json untouched if the batch failed
+        # Save back to file: write a temp file next to it and swap it in, so an
+        # interrupted save never leaves a truncated scenes.json behind
+        tmp_file = self.scenes_file + '.tmp'
+        if orjson is not None:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(self.scenes, option=orjson.OPT_INDENT_2))
+        else:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.scenes, f, indent=2)
+        os.replace(tmp_file, self.scenes_file)
+        for scene_name in self.updated:
+            print(f"✓ Updated '{scene_name}' in {self.scenes_file}")
+        return False
+
+
 def update_scenes_json(scene_name, scene_data, scenes_file='Tilesets/scenes.json'):
     """Update or add a scene to scenes.json."""
-    
-    # Load existing scenes
-    if os.path.exists(scenes_file):
-        with open(scenes_file, 'r') as f:
-            scenes = json.load(f)
-    else:
-        scenes = {}
-    
-    # Update with new scene
-    scenes[scene_name] = scene_data
-    
-    # Save back to file
-    with open(scenes_file, 'w') as f:
-        json.dump(scenes, f, indent=2)
-    
-    print(f"✓ Updated '{scene_name}' in {scenes_file}")
+    with ScenesWriter(scenes_file) as writer:
+        writer.update(scene_name, scene_data)
 
 
 def main():
@@ -345,7 +418,8 @@ def main():
     print(f"  Items: {len(scene_data['items'])}")
     
     # Update scenes.json
-    update_scenes_json(scene_name, scene_data)
+    with ScenesWriter() as writer:
+        writer.update(scene_name, scene_data)
     
     print(f"\n✓ Conversion complete! Your scene is ready to use in the game.")
     print(f"  Test it by pressing F1/F2/F3 or changing the initial scene in index.py")